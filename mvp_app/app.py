@@ -1,15 +1,17 @@
 """Streamlit MVP für Kapazitätsplanung."""
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
 try:
     from mvp_app.kpis import compute_kpis, top_drivers_for_date, weekly_sparkline
-    from mvp_app.logic import AMPel_COLORS, AmpelThresholds, describe_cell
+    from mvp_app.logic import AMPel_COLORS, AmpelThresholds, describe_cells
     from mvp_app.simulate import SimulationConfig, simulate_year, to_csv
     from mvp_app.utils import figure_to_svg_bytes, format_number, format_percentage
 except ModuleNotFoundError:  # Allow running via ``streamlit run mvp_app/app.py``
@@ -21,11 +23,13 @@ except ModuleNotFoundError:  # Allow running via ``streamlit run mvp_app/app.py`
         sys.path.insert(0, str(_PKG_DIR))
 
     from kpis import compute_kpis, top_drivers_for_date, weekly_sparkline
-    from logic import AMPel_COLORS, AmpelThresholds, describe_cell
+    from logic import AMPel_COLORS, AmpelThresholds, describe_cells
     from simulate import SimulationConfig, simulate_year, to_csv
     from utils import figure_to_svg_bytes, format_number, format_percentage
 
 
+MIN_YEAR = 2020
+MAX_YEAR = 2035
 DEFAULT_YEAR = date.today().year
 DEFAULT_PARAMS = {
     "param_year": DEFAULT_YEAR,
@@ -44,31 +48,6 @@ DEFAULT_PARAMS = {
     "param_ampel_gelb": 0.15,
 }
 
-import plotly.io as pio
-
-# Configure Kaleido for headless Chromium on Streamlit Cloud
-# (do this before any fig.to_image() calls)
-def _configure_kaleido():
-    # Optional defaults
-    pio.kaleido.scope.default_format = "png"
-    pio.kaleido.scope.default_width = 1200
-    pio.kaleido.scope.default_height = 700
-    # Headless Chromium args
-    pio.kaleido.scope.chromium_args = [
-        "--headless",
-        "--no-sandbox",
-        "--disable-dev-shm-usage",
-        "--single-process",
-        "--disable-gpu",
-    ]
-
-try:
-    _configure_kaleido()
-except Exception as e:
-    # Don't crash the app if Kaleido isn't used;
-    # you can log or print for debugging
-    print(f"Kaleido setup warning: {e}")
-
 
 def reset_defaults() -> None:
     for key, value in DEFAULT_PARAMS.items():
@@ -86,7 +65,7 @@ def sidebar_controls() -> Dict[str, float | int | str]:
 
     st.sidebar.caption("Interne Faktoren")
     year = st.sidebar.number_input(
-        "Jahr", min_value=2020, max_value=2035, step=1, key="param_year"
+        "Jahr", min_value=MIN_YEAR, max_value=MAX_YEAR, step=1, key="param_year"
     )
     seed = st.sidebar.number_input(
         "Seed", min_value=1, max_value=9999, step=1, key="param_seed"
@@ -217,14 +196,65 @@ def load_simulation(params: Dict[str, float | int | str]) -> pd.DataFrame:
         datenrhythmus=params["rhythm"],
     )
     df = simulate_year(config)
+    df["resource_code"] = df["resource"].cat.codes.astype("int8")
+    # Sorted axes for the heatmap, computed once per simulation (tuples keep attrs cheap to copy).
+    df.attrs["weeks"] = tuple(np.sort(df["week"].unique()).tolist())
+    df.attrs["resources"] = tuple(df["resource"].cat.categories)
     return df
 
 
-def build_line_chart(df: pd.DataFrame, resource: str) -> go.Figure:
-    filtered = df[df["resource"] == resource]
+@st.cache_data(show_spinner=False)
+def prepare_aggregates(params: Dict[str, float | int | str]) -> Dict[str, Any]:
+    """Cache the intermediates shared by the dashboard views across reruns."""
+
+    df = load_simulation(params)
+    driver_cols = [col for col in df.columns if col.startswith("driver_")]
+    weekly = (
+        df.groupby(["week", "resource"], as_index=False, observed=True, sort=False)
+        .agg(gap=("gap", "sum"), capacity_sum=("capacity", "sum"), days=("gap", "size"))
+    )
+    return {
+        "weekly": weekly,
+        "weeks": list(df.attrs["weeks"]),
+        "resources": list(df.attrs["resources"]),
+        "driver_totals": df.groupby("date", as_index=False)[driver_cols].sum(),
+        "by_resource": (
+            df.set_index("resource")[["date", "plan", "forecast", "capacity"]]
+            .sort_index(kind="stable")
+        ),
+    }
+
+
+@st.cache_resource
+def _prefetch_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+
+
+def prefetch_adjacent_years(params: Dict[str, float | int | str]) -> None:
+    """Warm the simulation caches for the neighbouring years in the background."""
+
+    executor = _prefetch_executor()
+    for year in (int(params["year"]) + 1, int(params["year"]) - 1):
+        if MIN_YEAR <= year <= MAX_YEAR:
+            executor.submit(prepare_aggregates, {**params, "year": year})
+
+
+@st.cache_data(show_spinner=False)
+def cached_csv(params: Dict[str, float | int | str]) -> str:
+    """CSV export for a parameter set, encoded once instead of on every rerun."""
+
+    return to_csv(load_simulation(params))
+
+
+def build_line_chart(
+    aggregates: Dict[str, Any], resource: str, webgl: bool = True
+) -> go.Figure:
+    # WebGL keeps the interactive chart responsive; SVG export needs vector traces.
+    scatter = go.Scattergl if webgl else go.Scatter
+    filtered = aggregates["by_resource"].loc[resource]
     fig = go.Figure()
     fig.add_trace(
-        go.Scatter(
+        scatter(
             x=filtered["date"],
             y=filtered["plan"],
             mode="lines",
@@ -233,7 +263,7 @@ def build_line_chart(df: pd.DataFrame, resource: str) -> go.Figure:
         )
     )
     fig.add_trace(
-        go.Scatter(
+        scatter(
             x=filtered["date"],
             y=filtered["forecast"],
             mode="lines",
@@ -242,7 +272,7 @@ def build_line_chart(df: pd.DataFrame, resource: str) -> go.Figure:
         )
     )
     fig.add_trace(
-        go.Scatter(
+        scatter(
             x=filtered["date"],
             y=filtered["capacity"],
             mode="lines",
@@ -263,60 +293,36 @@ def build_line_chart(df: pd.DataFrame, resource: str) -> go.Figure:
 
 
 def build_heatmap(
-    df: pd.DataFrame, thresholds: AmpelThresholds, nurse_ratio: float
+    aggregates: Dict[str, Any], thresholds: AmpelThresholds, nurse_ratio: float
 ) -> Tuple[go.Figure, List[Dict[str, float | str]]]:
-    grouped = (
-        df.groupby(["week", "resource"], as_index=False)
-        .agg(gap_sum=("gap", "sum"), capacity_sum=("capacity", "sum"), days=("gap", "size"))
+    cells = describe_cells(aggregates["weekly"], thresholds, nurse_ratio)
+    weeks = aggregates["weeks"]
+    resources = aggregates["resources"]
+
+    # One row per (resource, week) in grid order; missing cells stay "Keine Daten".
+    shape = (len(resources), len(weeks))
+    flat = (
+        cells.set_index(["resource", "kw"])
+        .reindex(pd.MultiIndex.from_product([resources, weeks], names=["resource", "kw"]))
+        .reset_index()
     )
-    grouped["norm_gap"] = grouped.apply(
-        lambda row: (row["gap_sum"] / row["capacity_sum"])
-        if row["capacity_sum"]
-        else 0.0,
-        axis=1,
+    hover = ("KW " + flat["kw"].astype(str)).str.cat(
+        [
+            "Ressource: " + flat["resource"].astype(str),
+            "Status: " + flat["status"].fillna("Keine Daten"),
+            "Norm-Gap: " + flat["norm_gap"].map("{:.1%}".format, na_action="ignore").fillna("–"),
+            "Gap: " + flat["gap"].map("{:.1f}".format, na_action="ignore").fillna("–"),
+            "Empfehlung: " + flat["empfehlung"].fillna("Keine Daten verfügbar"),
+        ],
+        sep="<br>",
     )
-    grouped.rename(columns={"gap_sum": "gap"}, inplace=True)
-
-    pivot = grouped.pivot(index="resource", columns="week", values="norm_gap")
-    weeks = sorted(df["week"].unique())
-    resources = sorted(df["resource"].unique())
-
-    cell_details: Dict[Tuple[str, int], Dict[str, float | str]] = {}
-    for _, row in grouped.iterrows():
-        cell_details[(row["resource"], int(row["week"]))] = describe_cell(row, thresholds, nurse_ratio)
-
-    hover_text: List[List[str]] = []
-    for resource in resources:
-        row_text = []
-        for week in weeks:
-            detail = cell_details.get(
-                (resource, int(week)),
-                {
-                    "status": "Keine Daten",
-                    "farbe": "#9e9e9e",
-                    "gap": float("nan"),
-                    "norm_gap": float("nan"),
-                    "empfehlung": "Keine Daten verfügbar",
-                },
-            )
-            row_text.append(
-                "<br>".join(
-                    [
-                        f"KW {week}",
-                        f"Ressource: {resource}",
-                        f"Status: {detail['status']}",
-                        f"Norm-Gap: {detail['norm_gap']:.1%}" if pd.notna(detail["norm_gap"]) else "Norm-Gap: –",
-                        f"Gap: {detail['gap']:.1f}" if pd.notna(detail["gap"]) else "Gap: –",
-                        f"Empfehlung: {detail['empfehlung']}",
-                    ]
-                )
-            )
-        hover_text.append(row_text)
+    hover_text = hover.to_numpy().reshape(shape)
+    norm_gap = flat["norm_gap"].to_numpy(dtype=float).reshape(shape)
 
     fig = go.Figure(
         data=[
             go.Heatmap(
-                z=pivot.reindex(index=resources, columns=weeks).values,
+                z=norm_gap,
                 x=weeks,
                 y=resources,
                 colorscale="RdYlGn_r",
@@ -337,13 +343,10 @@ def build_heatmap(
 
     # Prepare a list for detail view below the heatmap
     status_rank = {"ROT": 0, "GELB": 1, "GRÜN": 2, "BLAU": 3}
-    detail_rows = [detail for detail in cell_details.values()]
-    detail_rows.sort(
-        key=lambda item: (
-            status_rank.get(str(item["status"]), 4),
-            -abs(float(item.get("norm_gap", 0.0))),
-        )
+    order = np.lexsort(
+        (-cells["norm_gap"].abs().to_numpy(), cells["status"].map(status_rank).fillna(4).to_numpy())
     )
+    detail_rows = cells.iloc[order].to_dict("records")
     return fig, detail_rows
 
 
@@ -413,6 +416,8 @@ def main():
     )
     params = sidebar_controls()
     df = load_simulation(params)
+    aggregates = prepare_aggregates(params)
+    prefetch_adjacent_years(params)
     thresholds = AmpelThresholds(params["green"], params["yellow"])
     today = date.today()
 
@@ -425,7 +430,7 @@ def main():
             st.cache_data.clear()
             st.rerun()
     with col_right:
-        csv_string = to_csv(df)
+        csv_string = cached_csv(params)
         st.download_button(
             "Export CSV",
             data=csv_string,
@@ -437,13 +442,15 @@ def main():
 
     with tab_plan:
         st.subheader("Jahresverlauf")
-        resource = st.selectbox("Ressource", df["resource"].unique())
-        fig_line = build_line_chart(df, resource)
+        resource = st.selectbox("Ressource", aggregates["resources"])
+        fig_line = build_line_chart(aggregates, resource)
         st.plotly_chart(fig_line, use_container_width=True, config={"displaylogo": False})
-        svg_bytes = figure_to_svg_bytes(fig_line)
+        # Deferred: the SVG export only runs when the button is clicked.
         st.download_button(
             "Download SVG",
-            data=svg_bytes,
+            data=lambda: figure_to_svg_bytes(
+                build_line_chart(aggregates, resource, webgl=False)
+            ),
             file_name=f"jahresverlauf_{resource}.svg",
             mime="image/svg+xml",
         )
@@ -453,7 +460,7 @@ def main():
 
     with tab_control:
         st.subheader("Ampel-Heatmap & Empfehlungen")
-        fig_heatmap, details = build_heatmap(df, thresholds, params["nurse_ratio"])
+        fig_heatmap, details = build_heatmap(aggregates, thresholds, params["nurse_ratio"])
         st.plotly_chart(fig_heatmap, use_container_width=True, config={"displaylogo": False})
 
         st.markdown("**Empfehlungen (Top Kritikalität)**")
@@ -466,7 +473,7 @@ def main():
         st.markdown("**Wochen-Sparkline**")
         render_weekly_sparkline(spark)
 
-        drivers = top_drivers_for_date(df, today)
+        drivers = top_drivers_for_date(aggregates["driver_totals"], today)
         render_top_drivers(drivers)
 
 
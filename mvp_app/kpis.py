@@ -26,6 +26,30 @@ DRIVER_LABELS = {
 }
 
 
+def _weekly_mape(
+    weeks: np.ndarray,
+    resource_codes: np.ndarray,
+    actuals: np.ndarray,
+    forecast: np.ndarray,
+) -> float:
+    """Mean APE of weekly (week, resource) totals, accumulated via ``np.bincount``."""
+
+    if weeks.size == 0:
+        return 0.0
+    n_resources = int(resource_codes.max()) + 1
+    groups = weeks.astype(np.int64) * n_resources + resource_codes
+    present = np.bincount(groups) > 0
+    actual_sum = np.bincount(groups, weights=actuals)[present]
+    forecast_sum = np.bincount(groups, weights=forecast)[present]
+    ape = np.divide(
+        np.abs(actual_sum - forecast_sum),
+        actual_sum,
+        out=np.zeros_like(actual_sum),
+        where=actual_sum != 0,
+    )
+    return float(ape.mean())
+
+
 def compute_kpis(
     df: pd.DataFrame,
     today: date,
@@ -33,9 +57,8 @@ def compute_kpis(
 ) -> Dict[str, float]:
     """Aggregate KPI metrics for dashboards."""
 
-    df = df.copy()
-    df["is_past"] = df["date"].dt.date <= today
-    past = df[df["is_past"]]
+    past_mask = df["date"].to_numpy() <= np.datetime64(today)
+    past = df.loc[past_mask]
     if past.empty:
         past = df.head(7)
 
@@ -49,25 +72,23 @@ def compute_kpis(
     utilisation = float(min(1.0, utilisation))
 
     # MAPE across past weeks grouped by resource
-    past_weekly = (
-        past.groupby(["week", "resource"])[["actuals", "forecast"]]
-        .sum()
-        .reset_index()
-    )
-    if past_weekly.empty:
-        mape = 0.0
+    if "resource_code" in past:
+        resource_codes = past["resource_code"].to_numpy()
     else:
-        actual = past_weekly["actuals"].replace(0, np.nan)
-        forecast = past_weekly["forecast"]
-        mape = float((np.abs(actual - forecast) / actual).replace(np.nan, 0).mean())
+        resource_codes, _ = pd.factorize(past["resource"])
+    mape = _weekly_mape(
+        past["week"].to_numpy(),
+        resource_codes,
+        past["actuals"].to_numpy(dtype=np.float64),
+        past["forecast"].to_numpy(dtype=np.float64),
+    )
 
     # Wartetage proportional zu kumuliertem positiven Gap
-    positive_gap = past["gap"].clip(lower=0)
-    waiting_days = float(positive_gap.sum())
+    waiting_days = float(np.maximum(past["gap"].to_numpy(dtype=np.float64), 0.0).sum())
 
     # Stornoquote aus Überlastung
-    norm_gap_positive = past["norm_gap"].clip(lower=0)
-    cancellation_rate = float((0.005 + 0.05 * norm_gap_positive).mean())
+    norm_gap_positive = np.maximum(past["norm_gap"].to_numpy(dtype=np.float64), 0.0)
+    cancellation_rate = float(0.005 + 0.05 * norm_gap_positive.mean())
 
     # Pflege-Engpassindikator (0-100)
     nurse_pressure = past[past["resource"] == "Personal"]
@@ -87,6 +108,11 @@ def compute_kpis(
 
 
 def top_drivers_for_date(df: pd.DataFrame, target: date | None = None) -> List[Tuple[str, float]]:
+    """Top three driver contributions on ``target`` (or the nearest simulated date).
+
+    Accepts the raw simulation frame or pre-aggregated daily driver totals.
+    """
+
     if target is None:
         target = df["date"].dt.date.min() if df.empty else df["date"].dt.date.max()
 
@@ -98,25 +124,28 @@ def top_drivers_for_date(df: pd.DataFrame, target: date | None = None) -> List[T
         snapshot = df[df["date"].dt.date == nearest_date]
 
     driver_cols = [col for col in df.columns if col.startswith("driver_")]
-    contributions = snapshot.groupby("resource")[driver_cols].sum().sum(axis=0)
-    items = [(DRIVER_LABELS.get(k, k), float(v)) for k, v in contributions.items()]
-    items.sort(key=lambda item: abs(item[1]), reverse=True)
-    return items[:3]
+    contributions = snapshot[driver_cols].to_numpy(dtype=np.float64).sum(axis=0)
+    order = np.argsort(-np.abs(contributions), kind="stable")[:3]
+    return [
+        (DRIVER_LABELS.get(driver_cols[i], driver_cols[i]), float(contributions[i]))
+        for i in order
+    ]
 
 
 def weekly_sparkline(df: pd.DataFrame, today: date) -> pd.DataFrame:
     """Aggregate weekly actual vs forecast for sparkline plot."""
 
-    past = df[df["date"].dt.date <= today]
+    past = df[df["date"].to_numpy() <= np.datetime64(today)]
     if past.empty:
         past = df.head(30)
-    agg = (
-        past.groupby("week")[["actuals", "forecast", "capacity"]]
-        .sum()
-        .reset_index()
-        .sort_values("week")
-    )
-    return agg
+    # Weeks are small dense integers, so a bincount histogram replaces the hash groupby.
+    weeks = past["week"].to_numpy(dtype=np.int64)
+    present = np.bincount(weeks) > 0
+    agg = {"week": np.flatnonzero(present)}
+    for col in ("actuals", "forecast", "capacity"):
+        totals = np.bincount(weeks, weights=past[col].to_numpy(dtype=np.float64))
+        agg[col] = totals[present]
+    return pd.DataFrame(agg)
 
 
 __all__ = ["compute_kpis", "top_drivers_for_date", "weekly_sparkline", "DRIVER_LABELS"]
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import reduce
 import math
-from typing import Dict, Tuple
+from typing import Dict, Iterable, Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -16,6 +18,10 @@ AMPel_COLORS = {
 }
 
 
+_STATUS_LABELS = np.array(["GRÜN", "BLAU", "ROT", "GRÜN", "GELB", "ROT"])
+_STATUS_COLORS = np.array([AMPel_COLORS[label] for label in _STATUS_LABELS])
+
+
 @dataclass
 class AmpelThresholds:
     gruen: float = 0.05
@@ -39,6 +45,22 @@ def ampel_status(norm_gap: float, thresholds: AmpelThresholds) -> Tuple[str, str
     return "GRÜN", AMPel_COLORS["GRÜN"]
 
 
+def ampel_status_array(
+    norm_gap: np.ndarray, thresholds: AmpelThresholds
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorised :func:`ampel_status` returning (labels, colors) arrays."""
+
+    norm_gap = np.asarray(norm_gap, dtype=float)
+    # Bucket |norm_gap| into buffer / watch / critical bands; the sign picks BLAU vs GELB.
+    # A gelb threshold below gruen collapses the middle band, as in the scalar ladder,
+    # and zero counts as the positive side because the ladder checks ``>=`` first.
+    bins = np.array([min(thresholds.gruen, thresholds.gelb), thresholds.gelb])
+    band = np.searchsorted(bins, np.abs(norm_gap), side="right")
+    band = np.where(np.isnan(norm_gap), 0, band)
+    index = band + 3 * (norm_gap >= 0)
+    return _STATUS_LABELS[index], _STATUS_COLORS[index]
+
+
 def format_recommendation(
     resource: str,
     gap: float,
@@ -91,6 +113,83 @@ def format_recommendation(
     return ", ".join(suggestions)
 
 
+def _concat(*parts: np.ndarray | str) -> np.ndarray:
+    return reduce(np.char.add, parts)
+
+
+def _join_nonempty(parts: Iterable[np.ndarray], sep: str = ", ") -> np.ndarray:
+    parts = list(parts)
+    joined = parts[0]
+    for part in parts[1:]:
+        glue = np.where((joined != "") & (part != ""), sep, "")
+        joined = _concat(joined, glue, part)
+    return joined
+
+
+def format_recommendations(
+    resources: Iterable[str],
+    gap: np.ndarray,
+    capacity: np.ndarray,
+    nurse_ratio: float,
+    thresholds: AmpelThresholds,
+) -> np.ndarray:
+    """Vectorised :func:`format_recommendation` over aligned arrays."""
+
+    resources = np.asarray(resources).astype(str)
+    gap = np.asarray(gap, dtype=float)
+    capacity = np.asarray(capacity, dtype=float)
+
+    known = capacity > 0
+    norm_gap = np.divide(gap, capacity, out=np.zeros_like(gap), where=known)
+    status, _ = ampel_status_array(norm_gap, thresholds)
+
+    factor = np.where(status == "GELB", 0.35, 1.0)
+    shortage = np.maximum(0.0, gap) * factor
+    op_shift = np.ceil(shortage / np.maximum(capacity, 1) * 100).astype(np.int64)
+    open_beds = np.ceil(shortage / 2).astype(np.int64)
+    staff_reassign = np.ceil(shortage / max(nurse_ratio, 1e-6)).astype(np.int64)
+    release = np.ceil(np.abs(gap) * factor / 2).astype(np.int64)
+    fallback = np.maximum(1, np.ceil(np.abs(norm_gap) * 10)).astype(np.int64)
+
+    op_text = np.where(
+        np.isin(resources, ["OP", "Sprechstunden"]) & (op_shift > 0),
+        _concat("OP-Programm um ", op_shift.astype(str), "% glätten"),
+        "",
+    )
+    beds_text = np.where(
+        np.isin(resources, ["Betten", "Notfall"]) & (open_beds > 0),
+        _concat(open_beds.astype(str), " Betten temporär öffnen"),
+        "",
+    )
+    staff_text = np.where(
+        staff_reassign > 0,
+        _concat(staff_reassign.astype(str), " Pflege-Schichten umplanen"),
+        "",
+    )
+    suggestions = _join_nonempty([op_text, beds_text, staff_text])
+    suggestions = np.where(
+        suggestions == "",
+        _concat("Kapazität um ", fallback.astype(str), " Einheiten anpassen"),
+        suggestions,
+    )
+    overcapacity = _concat(
+        "Überkapazität nutzen: ",
+        release.astype(str),
+        " Termine vorziehen, Reservepersonal nur bei Bedarf einplanen,"
+        " Betten flexibel schließen.",
+    )
+
+    return np.select(
+        [~known, status == "GRÜN", gap <= 0],
+        [
+            np.full(gap.shape, "Kapazität unbekannt – manuelle Prüfung erforderlich."),
+            np.full(gap.shape, "Keine Maßnahmen nötig – innerhalb des Puffers."),
+            overcapacity,
+        ],
+        default=suggestions,
+    )
+
+
 def describe_cell(row: pd.Series, thresholds: AmpelThresholds, nurse_ratio: float) -> Dict[str, str | float]:
     gap = float(row["gap"])
     capacity = float(row["capacity_sum"])
@@ -110,4 +209,38 @@ def describe_cell(row: pd.Series, thresholds: AmpelThresholds, nurse_ratio: floa
     }
 
 
-__all__ = ["AmpelThresholds", "ampel_status", "format_recommendation", "describe_cell", "AMPel_COLORS"]
+def describe_cells(
+    grouped: pd.DataFrame, thresholds: AmpelThresholds, nurse_ratio: float
+) -> pd.DataFrame:
+    """Vectorised :func:`describe_cell` over a weekly (week, resource) aggregate."""
+
+    gap = grouped["gap"].to_numpy(dtype=float)
+    capacity = grouped["capacity_sum"].to_numpy(dtype=float)
+    norm_gap = np.divide(gap, capacity, out=np.zeros_like(gap), where=capacity != 0)
+    status, color = ampel_status_array(norm_gap, thresholds)
+    recommendation = format_recommendations(
+        grouped["resource"].to_numpy(), gap, capacity, nurse_ratio, thresholds
+    )
+    return pd.DataFrame(
+        {
+            "resource": grouped["resource"].to_numpy(),
+            "kw": grouped["week"].to_numpy(dtype=np.int64),
+            "status": status,
+            "farbe": color,
+            "gap": gap,
+            "norm_gap": norm_gap,
+            "empfehlung": recommendation,
+        }
+    )
+
+
+__all__ = [
+    "AmpelThresholds",
+    "ampel_status",
+    "ampel_status_array",
+    "format_recommendation",
+    "format_recommendations",
+    "describe_cell",
+    "describe_cells",
+    "AMPel_COLORS",
+]
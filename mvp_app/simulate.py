@@ -1,13 +1,24 @@
 """Data simulation module for the capacity planning MVP."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import date, datetime
-from typing import Dict, Iterable, Tuple
+from functools import lru_cache
+from io import BytesIO
+from typing import Dict, List, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pa = None
+
 
 RESOURCES: Tuple[str, ...] = (
     "Betten",
@@ -16,6 +27,10 @@ RESOURCES: Tuple[str, ...] = (
     "Sprechstunden",
     "Notfall",
 )
+# Category order of the ``resource`` column; alphabetical like the former string column.
+RESOURCE_CATEGORIES: Tuple[str, ...] = tuple(sorted(RESOURCES))
+# Precision of the simulated values; single precision is ample for synthetic daily counts.
+SIMULATION_DTYPE = np.float32
 
 RESOURCE_BASELINES: Dict[str, float] = {
     "Betten": 120.0,
@@ -76,7 +91,7 @@ BASE_ABSENCES = 0.05
 BASE_CLUSTER_COUNT = 4
 
 
-@dataclass
+@dataclass(frozen=True)
 class SimulationConfig:
     """Container for simulation parameters."""
 
@@ -103,31 +118,47 @@ class SimulationConfig:
         return date(self.year, 12, 31)
 
 
-class SimulationResult(pd.DataFrame):
-    """Typed DataFrame for simulation output."""
-
-    @property
-    def _constructor(self):  # type: ignore[override]
-        return SimulationResult
+# Simulation output is a plain DataFrame; the alias only documents intent in signatures.
+SimulationResult = pd.DataFrame
 
 
+@lru_cache(maxsize=8)
 def _date_range_for_year(year: int) -> pd.DatetimeIndex:
     start = datetime(year, 1, 1)
     end = datetime(year, 12, 31)
     return pd.date_range(start=start, end=end, freq="D")
 
 
+@lru_cache(maxsize=8)
+def _calendar_for_year(year: int) -> Dict[str, np.ndarray]:
+    """Calendar fields of every day in ``year``; the arrays are shared and read-only."""
+
+    dates = _date_range_for_year(year)
+    calendar = {
+        "day_of_year": dates.dayofyear.to_numpy(dtype=float),
+        "month": dates.month.to_numpy(),
+        "day": dates.day.to_numpy(),
+        "weekday": dates.weekday.to_numpy().astype(np.int8),
+        "week": dates.isocalendar().week.to_numpy(dtype=np.int16),
+    }
+    for values in calendar.values():
+        values.setflags(write=False)
+    return calendar
+
+
 def _generate_external_indices(
-    dates: Iterable[pd.Timestamp],
+    year: int,
     saisonalitaet_staerke: float,
     flu_factor: float,
     weather_factor: float,
     rng: np.random.Generator,
 ) -> Dict[str, np.ndarray]:
-    dates = list(dates)
-    n = len(dates)
-    days_in_year = 366 if dates[0].is_leap_year else 365
-    day_of_year = np.array([dt.timetuple().tm_yday for dt in dates], dtype=float)
+    calendar = _calendar_for_year(year)
+    day_of_year = calendar["day_of_year"]
+    months = calendar["month"]
+    days = calendar["day"]
+    n = len(day_of_year)
+    days_in_year = n
 
     # Smooth yearly sinusoidal component for general seasonality
     seasonality_base = np.sin(2 * np.pi * (day_of_year / days_in_year))
@@ -151,12 +182,16 @@ def _generate_external_indices(
         (8, 1),
     ]
     for month, day in holidays:
-        mask = [dt.month == month and abs(dt.day - day) <= 2 for dt in dates]
-        event_impact += 0.4 * np.array(mask, dtype=float)
+        mask = (months == month) & (np.abs(days - day) <= 2)
+        event_impact += 0.4 * mask
     # Additional random impulses (e.g., city marathon, fair)
     impulse_days = rng.choice(n, size=6, replace=False)
-    for idx in impulse_days:
-        event_impact[idx : idx + 2] += rng.uniform(0.2, 0.5)
+    impulse_values = rng.uniform(0.2, 0.5, size=6)
+    # Each impulse lasts two days; the second day is dropped when it falls past year end.
+    positions = np.concatenate([impulse_days, impulse_days + 1])
+    values = np.concatenate([impulse_values, impulse_values])
+    in_year = positions < n
+    np.add.at(event_impact, positions[in_year], values[in_year])
 
     # Seasonality channel for further adjustments
     seasonality = saisonalitaet_staerke * seasonality_base
@@ -169,147 +204,202 @@ def _generate_external_indices(
     }
 
 
-def _year_fraction(idx: int, total: int) -> float:
+def _year_fraction(idx: np.ndarray, total: int) -> np.ndarray:
     return idx / max(1, total - 1)
 
 
 def simulate_year(config: SimulationConfig) -> SimulationResult:
-    """Simulate plan, forecast, capacity and drivers for all resources."""
+    """Simulate plan, forecast, capacity and drivers for all resources.
+
+    Results are memoised per config; callers receive a copy they may modify.
+    """
+
+    # Pin "today" before the cache lookup so a cached run never outlives the date it used.
+    resolved = replace(config, today=config.resolve_today())
+    return _simulate_year_cached(resolved).copy()
 
+
+@lru_cache(maxsize=32)
+def _simulate_year_cached(config: SimulationConfig) -> SimulationResult:
     dates = _date_range_for_year(config.year)
     rng = np.random.default_rng(config.seed)
     todays_date = config.resolve_today()
     external = _generate_external_indices(
-        dates,
+        config.year,
         config.saisonalitaet_staerke,
         config.flu_index_staerke,
         config.weather_risk_staerke,
         rng,
     )
     total_days = len(dates)
+    n_resources = len(RESOURCES)
+
+    # Everything below is evaluated on a (resource, day) grid: per-resource values are
+    # (R, 1) columns, per-day values are (N,) rows and broadcast against each other.
+    def resource_column(weights: Dict[str, Dict[str, float]], key: str) -> np.ndarray:
+        values = [weights[resource][key] for resource in RESOURCES]
+        return np.array(values, dtype=SIMULATION_DTYPE)[:, None]
+
+    base = np.array(
+        [RESOURCE_BASELINES[resource] for resource in RESOURCES], dtype=SIMULATION_DTYPE
+    )[:, None]
+
+    year_progress = _year_fraction(np.arange(total_days, dtype=SIMULATION_DTYPE), total_days)
+    calendar = _calendar_for_year(config.year)
+    weekday = calendar["weekday"]
+    weekend_factor = np.where(weekday >= 5, 0.05, -0.03).astype(SIMULATION_DTYPE)
+    trend_factor = 0.05 * (year_progress - 0.5)  # symmetric around mid-year
+
+    seasonality = external["seasonality"].astype(SIMULATION_DTYPE)
+    flu_idx = external["flu_index"].astype(SIMULATION_DTYPE)
+    weather_risk = external["weather_risk"].astype(SIMULATION_DTYPE)
+    event_impact = external["event_impact"].astype(SIMULATION_DTYPE)
+
+    # Plan baseline with growth and seasonality
+    plan_base = base * (1 + config.budget_growth)
+    plan_modifiers = 1 + 0.25 * seasonality + weekend_factor + trend_factor * 0.3
+    plan_value = plan_base * plan_modifiers
+
+    # Internal parameter deltas as percentage adjustments
+    verweildauer_pct = (
+        resource_column(RESOURCE_INTERNAL_WEIGHTS, "verweildauer")
+        * config.verweildauer_delta
+        * 0.02
+    )
+    op_zeiten_pct = (
+        resource_column(RESOURCE_INTERNAL_WEIGHTS, "op_zeiten")
+        * (config.op_zeiten_delta / 60.0)
+        * 0.05
+    )
+    nurse_ratio_pct = resource_column(RESOURCE_INTERNAL_WEIGHTS, "nurse_ratio") * (
+        (BASE_NURSE_RATIO - config.nurse_ratio) / BASE_NURSE_RATIO
+    ) * 0.6
+    abwesenheiten_pct = resource_column(RESOURCE_INTERNAL_WEIGHTS, "abwesenheiten") * (
+        (config.abwesenheiten - BASE_ABSENCES) / max(BASE_ABSENCES, 1e-3)
+    ) * 0.4
+    cluster_pct = resource_column(RESOURCE_INTERNAL_WEIGHTS, "cluster") * (
+        (config.cluster_anzahl - BASE_CLUSTER_COUNT) / max(BASE_CLUSTER_COUNT, 1)
+    ) * 0.05
+
+    internal_pct = (
+        verweildauer_pct
+        + op_zeiten_pct
+        + nurse_ratio_pct
+        + abwesenheiten_pct
+        + cluster_pct
+    )
 
-    data_rows = []
-
-    for resource in RESOURCES:
-        base = RESOURCE_BASELINES[resource]
-        ext_weights = RESOURCE_EXTERNAL_WEIGHTS[resource]
-        int_weights = RESOURCE_INTERNAL_WEIGHTS[resource]
-
-        for idx, current_date in enumerate(dates):
-            year_progress = _year_fraction(idx, total_days)
-            weekday = current_date.weekday()
-            weekend_factor = 0.05 if weekday >= 5 else -0.03
-            trend_factor = 0.05 * (year_progress - 0.5)  # symmetric around mid-year
-
-            seasonality = external["seasonality"][idx]
-            flu_idx = external["flu_index"][idx]
-            weather_risk = external["weather_risk"][idx]
-            event_impact = external["event_impact"][idx]
-
-            # Plan baseline with growth and seasonality
-            plan_base = base * (1 + config.budget_growth)
-            plan_modifiers = 1 + 0.25 * seasonality + weekend_factor + trend_factor * 0.3
-            plan_value = plan_base * plan_modifiers
-
-            # Internal parameter deltas as percentage adjustments
-            verweildauer_pct = int_weights["verweildauer"] * config.verweildauer_delta * 0.02
-            op_zeiten_pct = int_weights["op_zeiten"] * (config.op_zeiten_delta / 60.0) * 0.05
-            nurse_ratio_pct = int_weights["nurse_ratio"] * (
-                (BASE_NURSE_RATIO - config.nurse_ratio) / BASE_NURSE_RATIO
-            ) * 0.6
-            abwesenheiten_pct = int_weights["abwesenheiten"] * (
-                (config.abwesenheiten - BASE_ABSENCES) / max(BASE_ABSENCES, 1e-3)
-            ) * 0.4
-            cluster_pct = int_weights["cluster"] * (
-                (config.cluster_anzahl - BASE_CLUSTER_COUNT) / max(BASE_CLUSTER_COUNT, 1)
-            ) * 0.05
-
-            internal_pct = (
-                verweildauer_pct
-                + op_zeiten_pct
-                + nurse_ratio_pct
-                + abwesenheiten_pct
-                + cluster_pct
-            )
-
-            # External factors as percentage adjustments
-            external_pct = (
-                ext_weights["flu_index"] * flu_idx * 0.4
-                + ext_weights["weather_risk"] * weather_risk * 0.3
-                + ext_weights["event_impact"] * event_impact * 0.2
-            )
-
-            forecast_raw = plan_value * (1 + internal_pct + external_pct)
-
-            capacity_buffer = 0.9 + 0.1 * (1 - config.abwesenheiten / 0.12)
-            capacity = base * capacity_buffer * (1 + 0.15 * seasonality - 0.5 * weekend_factor)
-
-            noise_scale = base * 0.08
-            actuals = max(0.0, forecast_raw + rng.normal(0, noise_scale))
-
-            drivers = {
-                "flu_index": plan_value * ext_weights["flu_index"] * flu_idx * 0.4,
-                "weather_risk": plan_value * ext_weights["weather_risk"] * weather_risk * 0.3,
-                "event_impact": plan_value * ext_weights["event_impact"] * event_impact * 0.2,
-                "verweildauer": plan_value * verweildauer_pct,
-                "op_zeiten": plan_value * op_zeiten_pct,
-                "nurse_ratio": plan_value * nurse_ratio_pct,
-                "abwesenheiten": plan_value * abwesenheiten_pct,
-                "cluster": plan_value * cluster_pct,
-            }
-
-            driver_sum = sum(drivers.values())
-            gap_total = forecast_raw - plan_value
-            drivers["rest"] = gap_total - driver_sum
-
-            data_rows.append(
-                {
-                    "date": current_date,
-                    "resource": resource,
-                    "plan": plan_value,
-                    "forecast_raw": forecast_raw,
-                    "capacity": capacity,
-                    "actuals": actuals,
-                    "weekday": weekday,
-                    "week": current_date.isocalendar().week,
-                    "flu_index": flu_idx,
-                    "weather_risk": weather_risk,
-                    "event_impact": event_impact,
-                    "seasonality": seasonality,
-                    "drivers": drivers,
-                }
-            )
-
-    df = SimulationResult(data_rows)
-    df = _apply_driver_columns(df)
+    # External factors as percentage adjustments
+    ext_flu = resource_column(RESOURCE_EXTERNAL_WEIGHTS, "flu_index")
+    ext_weather = resource_column(RESOURCE_EXTERNAL_WEIGHTS, "weather_risk")
+    ext_event = resource_column(RESOURCE_EXTERNAL_WEIGHTS, "event_impact")
+    external_pct = (
+        ext_flu * flu_idx * 0.4
+        + ext_weather * weather_risk * 0.3
+        + ext_event * event_impact * 0.2
+    )
+
+    forecast_raw = plan_value * (1 + internal_pct + external_pct)
+
+    capacity_buffer = 0.9 + 0.1 * (1 - config.abwesenheiten / 0.12)
+    capacity = base * capacity_buffer * (1 + 0.15 * seasonality - 0.5 * weekend_factor)
+
+    # One standard-normal draw per cell in resource-major order, scaled per resource.
+    # Drawn in double precision so a seed yields the same noise as before the downcast.
+    actuals = rng.standard_normal((n_resources, total_days)).astype(SIMULATION_DTYPE)
+    actuals *= base * 0.08
+    actuals += forecast_raw
+    np.maximum(actuals, 0.0, out=actuals)
+
+    drivers = {
+        "flu_index": plan_value * ext_flu * flu_idx * 0.4,
+        "weather_risk": plan_value * ext_weather * weather_risk * 0.3,
+        "event_impact": plan_value * ext_event * event_impact * 0.2,
+        "verweildauer": plan_value * verweildauer_pct,
+        "op_zeiten": plan_value * op_zeiten_pct,
+        "nurse_ratio": plan_value * nurse_ratio_pct,
+        "abwesenheiten": plan_value * abwesenheiten_pct,
+        "cluster": plan_value * cluster_pct,
+    }
+
+    # One reduction over the stacked (driver, resource, day) block.
+    driver_sum = np.stack(list(drivers.values())).sum(axis=0)
+    gap_total = forecast_raw - plan_value
+    drivers["rest"] = gap_total - driver_sum
+
+    # Columnar construction: resource-major flattening of the grid, per-day values tiled.
+    per_day = {
+        "weekday": weekday,
+        "week": calendar["week"],
+        "flu_index": flu_idx,
+        "weather_risk": weather_risk,
+        "event_impact": event_impact,
+        "seasonality": seasonality,
+    }
+    columns = {
+        "date": np.tile(dates.to_numpy(), n_resources),
+        "resource": pd.Categorical.from_codes(
+            np.repeat(
+                np.array([RESOURCE_CATEGORIES.index(name) for name in RESOURCES], np.int8),
+                total_days,
+            ),
+            categories=RESOURCE_CATEGORIES,
+        ),
+        "plan": plan_value.ravel(),
+        "forecast_raw": forecast_raw.ravel(),
+        "capacity": capacity.ravel(),
+        "actuals": actuals.ravel(),
+    }
+    columns.update((name, np.tile(values, n_resources)) for name, values in per_day.items())
+    columns.update((f"driver_{key}", values.ravel()) for key, values in drivers.items())
+    # The arrays are freshly allocated here, so the frame can adopt them without copying.
+    df = pd.DataFrame(columns, copy=False)
     df = assimilate_forecasts(df, config, todays_date)
 
-    df["gap"] = df["forecast"] - df["capacity"]
-    df["norm_gap"] = df["gap"] / df["capacity"].where(df["capacity"] > 0, 1)
+    forecast = df["forecast"].to_numpy()
+    capacity = df["capacity"].to_numpy()
+    gap = forecast - capacity
+    df["gap"] = gap
+    df["norm_gap"] = gap / np.where(capacity > 0, capacity, 1)
     df["actuals_to_date"] = np.where(
-        df["date"].dt.date <= todays_date,
-        df["actuals"],
+        df["date"].to_numpy() <= np.datetime64(todays_date),
+        df["actuals"].to_numpy(),
         np.nan,
     )
 
     return df
 
 
-def _apply_driver_columns(df: SimulationResult) -> SimulationResult:
-    driver_keys = [
-        "flu_index",
-        "weather_risk",
-        "event_impact",
-        "verweildauer",
-        "op_zeiten",
-        "nurse_ratio",
-        "abwesenheiten",
-        "cluster",
-        "rest",
-    ]
-    for key in driver_keys:
-        df[f"driver_{key}"] = df["drivers"].apply(lambda d: float(d.get(key, 0.0)))
-    return df
+def simulate_many(configs: Sequence[SimulationConfig]) -> List[SimulationResult]:
+    """Simulate several independent scenarios, one worker process per config."""
+
+    configs = list(configs)
+    workers = min(len(configs), os.cpu_count() or 1)
+    if workers <= 1:
+        return [simulate_year(config) for config in configs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(simulate_year, configs))
+
+
+def _assimilate_series(
+    forecast_raw: np.ndarray,
+    actuals: np.ndarray,
+    mask: np.ndarray,
+    alpha: float,
+) -> np.ndarray:
+    """Apply the exponentially smoothed correction to one resource's forecast."""
+
+    # The correction only changes on assimilation days, so the recurrence runs over
+    # those events and the result is carried forward to the following days.
+    events = np.flatnonzero(mask)
+    corrections = np.zeros(events.size + 1)
+    correction = 0.0
+    for k, (actual, baseline) in enumerate(
+        zip(actuals[events].tolist(), forecast_raw[events].tolist()), start=1
+    ):
+        correction = (1 - alpha) * correction + alpha * (actual - baseline)
+        corrections[k] = correction
+    return forecast_raw + corrections[np.cumsum(mask)]
 
 
 def assimilate_forecasts(
@@ -321,33 +411,27 @@ def assimilate_forecasts(
     """Assimilate actuals into forecasts based on rhythm (weekly/monthly)."""
 
     df = df.sort_values(["resource", "date"]).copy()
-    adjusted = []
     rhythm = config.datenrhythmus.lower()
 
-    def should_assimilate(timestamp: pd.Timestamp) -> bool:
-        if timestamp.date() > todays_date:
-            return False
-        if rhythm.startswith("w"):
-            return timestamp.weekday() == 6  # Sunday
-        if rhythm.startswith("m"):
-            return timestamp.day == 1
-        return False
-
-    for resource, group in df.groupby("resource", sort=False):
-        correction = 0.0
-        last_forecast = 0.0
-        rows = []
-        for _, row in group.iterrows():
-            baseline_forecast = float(row["forecast_raw"])
-            last_forecast = baseline_forecast + correction
-
-            if should_assimilate(row["date"]):
-                difference = float(row["actuals"]) - baseline_forecast
-                correction = (1 - alpha) * correction + alpha * difference
-                last_forecast = baseline_forecast + correction
-
-            rows.append(last_forecast)
-        adjusted.extend(rows)
+    # Assimilation days up to today for the configured rhythm, built once for all rows.
+    dates = df["date"]
+    mask = dates.to_numpy() <= np.datetime64(todays_date)
+    if rhythm.startswith("w"):
+        mask &= dates.dt.weekday.to_numpy() == 6  # Sunday
+    elif rhythm.startswith("m"):
+        mask &= dates.dt.day.to_numpy() == 1
+    else:
+        mask[:] = False
+
+    forecast_raw = df["forecast_raw"].to_numpy()
+    actuals = df["actuals"].to_numpy()
+    adjusted = np.empty_like(forecast_raw)
+    # Rows are sorted by resource, so each group is a contiguous block of positions.
+    for positions in df.groupby("resource", sort=False, observed=True).indices.values():
+        block = slice(positions[0], positions[-1] + 1)
+        adjusted[block] = _assimilate_series(
+            forecast_raw[block], actuals[block], mask[block], alpha
+        )
 
     df["forecast"] = adjusted
     return df
@@ -376,15 +460,38 @@ def to_csv(df: SimulationResult) -> str:
         "driver_cluster",
         "driver_rest",
     ]
-    csv_buffer = df[export_cols].copy()
-    csv_buffer["date"] = csv_buffer["date"].dt.strftime("%Y-%m-%d")
-    return csv_buffer.to_csv(index=False, float_format="%.3f")
+    if pa is None:
+        return df[export_cols].to_csv(
+            index=False, float_format="%.3f", date_format="%Y-%m-%d"
+        )
+
+    # Arrow's C++ writer; decimals with scale 3 reproduce the ``%.3f`` float format.
+    table = pa.Table.from_pandas(df[export_cols], preserve_index=False)
+    columns = []
+    for name, column in zip(table.column_names, table.columns):
+        if name == "date":
+            column = column.cast(pa.date32())
+        elif name == "resource":
+            column = column.cast(pa.string())
+        else:
+            # Round in double precision, as ``%.3f`` does, so float32 ties match.
+            column = pc.round(column.cast(pa.float64()), 3).cast(pa.decimal128(18, 3))
+        columns.append(column)
+    buffer = BytesIO()
+    buffer.write((",".join(export_cols) + "\n").encode("utf-8"))
+    pa_csv.write_csv(
+        pa.table(columns, names=table.column_names),
+        buffer,
+        write_options=pa_csv.WriteOptions(include_header=False, quoting_style="none"),
+    )
+    return buffer.getvalue().decode("utf-8")
 
 
 __all__ = [
     "SimulationConfig",
     "SimulationResult",
     "simulate_year",
+    "simulate_many",
     "assimilate_forecasts",
     "to_csv",
 ]
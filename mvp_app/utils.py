@@ -2,11 +2,60 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
+from html import escape
 from io import BytesIO
-from typing import Any
+import math
+from typing import Any, List, Tuple
+import warnings
 
 import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
+
+try:
+    import kaleido
+except ImportError:  # pragma: no cover - only needed for non-line charts
+    kaleido = None
+
+
+SVG_WIDTH = 1200
+SVG_HEIGHT = 700
+
+_DASH_PATTERNS = {
+    "dot": "3,3",
+    "dash": "9,9",
+    "longdash": "15,15",
+    "dashdot": "9,3,3,3",
+    "longdashdot": "15,6,3,6",
+}
+_DEFAULT_COLORS = ("#636efa", "#ef553b", "#00cc96", "#ab63fa", "#ffa15a", "#19d3f3")
+_EPOCH = pd.Timestamp(0)
+
+
+def _configure_kaleido() -> None:
+    """Set up Kaleido's headless Chromium once, before any ``fig.to_image`` call."""
+
+    scope = getattr(pio.kaleido, "scope", None)
+    if scope is None:  # Kaleido not installed; the native SVG writer still works.
+        return
+    scope.default_format = "png"
+    scope.default_width = SVG_WIDTH
+    scope.default_height = SVG_HEIGHT
+    scope.chromium_args = (
+        "--headless",
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--single-process",
+        "--disable-gpu",
+    )
+
+
+try:
+    _configure_kaleido()
+except Exception as exc:  # pragma: no cover - never block the app on export setup
+    warnings.warn(f"Kaleido setup failed: {exc}", RuntimeWarning, stacklevel=1)
 
 
 @dataclass
@@ -26,14 +75,200 @@ def format_number(value: float, digits: int = 0) -> str:
     return formatted.replace(",", " ")
 
 
-def figure_to_svg_bytes(fig: go.Figure) -> bytes:
-    fig.kaleido.scope.chromium_args = (
-        "--headless",
-        "--no-sandbox",
-        "--single-process",
-        "--disable-gpu"
+def _axis_values(values: Any) -> Tuple[np.ndarray, bool]:
+    """Return plot coordinates for ``values`` and whether they are dates (in days)."""
+
+    array = np.asarray(values)
+    if array.dtype.kind in "iufb":
+        return array.astype(float), False
+    try:
+        dates = pd.to_datetime(array)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Only numeric or date axes are supported") from exc
+    return ((dates - _EPOCH) / pd.Timedelta(days=1)).to_numpy(dtype=float), True
+
+
+def _nice_ticks(low: float, high: float, target: int = 6) -> np.ndarray:
+    raw_step = (high - low) / target
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw_step)
+    return np.arange(math.ceil(low / step) * step, high + step * 1e-9, step)
+
+
+def _date_ticks(low: float, high: float) -> List[Tuple[float, str]]:
+    start = (_EPOCH + pd.Timedelta(days=low)).normalize()
+    end = _EPOCH + pd.Timedelta(days=high)
+    months = pd.date_range(start.replace(day=1), end, freq="MS")
+    months = months[months >= start]
+    months = months[:: max(1, math.ceil(len(months) / 12))]
+    return [
+        (
+            (month - _EPOCH) / pd.Timedelta(days=1),
+            month.strftime("%b %Y" if idx == 0 or month.month == 1 else "%b"),
+        )
+        for idx, month in enumerate(months)
+    ]
+
+
+def _svg_font(size: int = 12) -> str:
+    return f'font-family="Arial, sans-serif" font-size="{size}" fill="#2a3f5f"'
+
+
+def _svg_path(xs: np.ndarray, ys: np.ndarray) -> str:
+    commands = []
+    pen_down = False
+    for px, py in zip(xs, ys):
+        if math.isnan(px) or math.isnan(py):
+            pen_down = False  # leave gaps open, like plotly's connectgaps=False
+            continue
+        commands.append(f"{'L' if pen_down else 'M'}{px:.2f},{py:.2f}")
+        pen_down = True
+    return " ".join(commands)
+
+
+def _line_figure_to_svg(fig: go.Figure) -> str:
+    """Render a figure of scatter/line traces as a standalone SVG document."""
+
+    layout = fig.layout
+    width = layout.width or SVG_WIDTH
+    height = layout.height or SVG_HEIGHT
+    left, right, top, bottom = 80, 30, 70, 60
+    plot_w, plot_h = width - left - right, height - top - bottom
+
+    series = []
+    x_is_date = False
+    for trace in fig.data:
+        xs, is_date = _axis_values(trace.x if trace.x is not None else np.arange(len(trace.y)))
+        x_is_date = x_is_date or is_date
+        series.append((trace, xs, np.asarray(trace.y, dtype=float)))
+
+    all_x = np.concatenate([xs for _, xs, _ in series])
+    all_y = np.concatenate([ys for _, _, ys in series])
+    x_min, x_max = float(np.nanmin(all_x)), float(np.nanmax(all_x))
+    y_min, y_max = float(np.nanmin(all_y)), float(np.nanmax(all_y))
+    if x_max == x_min:
+        x_min, x_max = x_min - 1, x_max + 1
+    y_pad = 0.05 * ((y_max - y_min) or abs(y_max) or 1.0)
+    y_min, y_max = y_min - y_pad, y_max + y_pad
+
+    def sx(value: np.ndarray | float) -> np.ndarray | float:
+        return left + (value - x_min) / (x_max - x_min) * plot_w
+
+    def sy(value: np.ndarray | float) -> np.ndarray | float:
+        return top + (y_max - value) / (y_max - y_min) * plot_h
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">',
+        f'<rect width="{width}" height="{height}" fill="white"/>',
+    ]
+
+    for tick in _nice_ticks(y_min, y_max):
+        y = sy(tick)
+        parts.append(
+            f'<line x1="{left}" x2="{left + plot_w}" y1="{y:.2f}" y2="{y:.2f}" stroke="#ebf0f8"/>'
+        )
+        parts.append(
+            f'<text x="{left - 8}" y="{y + 4:.2f}" text-anchor="end" {_svg_font()}>{tick:g}</text>'
+        )
+    if x_is_date:
+        x_ticks = _date_ticks(x_min, x_max)
+    else:
+        x_ticks = [(tick, f"{tick:g}") for tick in _nice_ticks(x_min, x_max)]
+    for tick, label in x_ticks:
+        x = sx(tick)
+        parts.append(
+            f'<line x1="{x:.2f}" x2="{x:.2f}" y1="{top}" y2="{top + plot_h}" stroke="#ebf0f8"/>'
+        )
+        parts.append(
+            f'<text x="{x:.2f}" y="{top + plot_h + 18}" text-anchor="middle" {_svg_font()}>'
+            f"{escape(label)}</text>"
+        )
+
+    legend = []
+    for idx, (trace, xs, ys) in enumerate(series):
+        line = trace.line
+        color = (line.color if line and line.color else None) or _DEFAULT_COLORS[
+            idx % len(_DEFAULT_COLORS)
+        ]
+        stroke_width = (line.width if line and line.width else None) or 2
+        dash = _DASH_PATTERNS.get(line.dash if line else None, "")
+        dash_attr = f' stroke-dasharray="{dash}"' if dash else ""
+        mode = trace.mode or "lines"
+        if "lines" in mode:
+            parts.append(
+                f'<path d="{_svg_path(sx(xs), sy(ys))}" fill="none" stroke="{color}" '
+                f'stroke-width="{stroke_width}"{dash_attr}/>'
+            )
+        if "markers" in mode:
+            for px, py in zip(sx(xs), sy(ys)):
+                if not (math.isnan(px) or math.isnan(py)):
+                    parts.append(f'<circle cx="{px:.2f}" cy="{py:.2f}" r="3" fill="{color}"/>')
+        if trace.name and trace.showlegend is not False:
+            legend.append((trace.name, color, stroke_width, dash_attr))
+
+    parts.append(
+        f'<rect x="{left}" y="{top}" width="{plot_w}" height="{plot_h}" '
+        'fill="none" stroke="#d0d7e2"/>'
     )
-    buffer = fig.to_image(format="svg")
+
+    if legend and layout.showlegend is not False:
+        item_widths = [40 + 7 * len(name) for name, *_ in legend]
+        x = width - right - sum(item_widths)
+        for (name, color, stroke_width, dash_attr), item_width in zip(legend, item_widths):
+            parts.append(
+                f'<line x1="{x}" x2="{x + 30}" y1="{top - 20}" y2="{top - 20}" stroke="{color}" '
+                f'stroke-width="{stroke_width}"{dash_attr}/>'
+            )
+            parts.append(f'<text x="{x + 35}" y="{top - 16}" {_svg_font()}>{escape(name)}</text>')
+            x += item_width
+
+    if layout.title and layout.title.text:
+        parts.append(
+            f'<text x="{left}" y="24" {_svg_font(16)}>{escape(layout.title.text)}</text>'
+        )
+    if layout.xaxis.title and layout.xaxis.title.text:
+        parts.append(
+            f'<text x="{left + plot_w / 2:.2f}" y="{height - 15}" text-anchor="middle" '
+            f"{_svg_font()}>{escape(layout.xaxis.title.text)}</text>"
+        )
+    if layout.yaxis.title and layout.yaxis.title.text:
+        parts.append(
+            f'<text transform="translate(20,{top + plot_h / 2:.2f}) rotate(-90)" '
+            f'text-anchor="middle" {_svg_font()}>{escape(layout.yaxis.title.text)}</text>'
+        )
+
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def figure_to_svg_bytes(fig: go.Figure) -> bytes:
+    """Export ``fig`` as SVG.
+
+    Line/scatter figures are serialised directly; anything else falls back to Kaleido.
+    """
+
+    if fig.data and all(trace.type in ("scatter", "scattergl") for trace in fig.data):
+        try:
+            return _line_figure_to_svg(fig).encode("utf-8")
+        except ValueError:
+            pass
+    return _kaleido_svg_bytes(fig)
+
+
+def _kaleido_svg_bytes(fig: go.Figure) -> bytes:
+    if kaleido is None:
+        raise RuntimeError(
+            "SVG export of this figure requires the optional 'kaleido' package; "
+            "only line charts with numeric or date axes are rendered without it."
+        )
+    # Each Kaleido render costs a Chromium round trip, so repeat exports reuse the result.
+    return _cached_kaleido_svg(fig.to_json())
+
+
+@lru_cache(maxsize=16)
+def _cached_kaleido_svg(fig_json: str) -> bytes:
+    buffer = pio.from_json(fig_json).to_image(format="svg")
     if isinstance(buffer, bytes):
         return buffer
     if isinstance(buffer, str):
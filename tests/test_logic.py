@@ -0,0 +1,80 @@
+"""Parity tests for the vectorised Ampel helpers against the scalar versions."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mvp_app.logic import AmpelThresholds, describe_cell, describe_cells
+
+RESOURCES = ["Betten", "Notfall", "OP", "Personal", "Sprechstunden"]
+
+
+def _grouped(seed: int = 0, rows: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    capacity = rng.uniform(50, 900, rows)
+    gap = capacity * rng.normal(0, 0.2, rows)
+    frame = pd.DataFrame(
+        {
+            "week": rng.integers(1, 54, rows),
+            "resource": rng.choice(RESOURCES, rows),
+            "gap": gap,
+            "capacity_sum": capacity,
+        }
+    )
+    edge_cases = pd.DataFrame(
+        {
+            "week": [1, 2, 3, 4, 5, 6, 7, 8],
+            "resource": [
+                "Betten", "OP", "Personal", "Notfall", "Sprechstunden", "OP", "Betten", "Personal"
+            ],
+            "gap": [12.0, -4.0, 0.0, 5.0, -30.0, 0.0, 0.4, -0.2],
+            "capacity_sum": [0.0, 0.0, 0.0, -50.0, -10.0, 80.0, 0.5, 0.3],
+        }
+    )
+    return pd.concat([frame, edge_cases], ignore_index=True)
+
+
+def _assert_matches_scalar(
+    grouped: pd.DataFrame, thresholds: AmpelThresholds, nurse_ratio: float
+) -> None:
+    vectorised = describe_cells(grouped, thresholds, nurse_ratio)
+    assert len(vectorised) == len(grouped)
+    for (_, row), cell in zip(grouped.iterrows(), vectorised.to_dict("records")):
+        expected = describe_cell(row, thresholds, nurse_ratio)
+        assert cell["resource"] == expected["resource"]
+        assert cell["kw"] == expected["kw"]
+        assert cell["status"] == expected["status"]
+        assert cell["farbe"] == expected["farbe"]
+        assert cell["empfehlung"] == expected["empfehlung"]
+        assert cell["gap"] == pytest.approx(expected["gap"])
+        assert cell["norm_gap"] == pytest.approx(expected["norm_gap"])
+
+
+@pytest.mark.parametrize(
+    "gruen, gelb",
+    [(0.05, 0.15), (0.01, 0.30), (0.10, 0.05), (0.0, 0.15), (0.0, 0.0)],
+)
+def test_describe_cells_matches_describe_cell_across_thresholds(gruen, gelb):
+    _assert_matches_scalar(_grouped(), AmpelThresholds(gruen, gelb), nurse_ratio=5.0)
+
+
+def test_describe_cells_handles_zero_and_negative_capacity():
+    grouped = _grouped(rows=0)
+    _assert_matches_scalar(grouped, AmpelThresholds(), nurse_ratio=5.0)
+    cells = describe_cells(grouped, AmpelThresholds(), nurse_ratio=5.0)
+    unknown = cells["empfehlung"].str.startswith("Kapazität unbekannt")
+    assert unknown.tolist() == (grouped["capacity_sum"] <= 0).tolist()
+
+
+@pytest.mark.parametrize("nurse_ratio", [1e-9, 0.5, 12.0])
+def test_describe_cells_matches_describe_cell_for_tiny_nurse_ratio(nurse_ratio):
+    _assert_matches_scalar(_grouped(seed=3), AmpelThresholds(), nurse_ratio)
+
+
+def test_describe_cells_returns_empty_frame_for_empty_input():
+    cells = describe_cells(_grouped(rows=0).iloc[:0], AmpelThresholds(), nurse_ratio=5.0)
+    assert cells.empty
+    assert list(cells.columns) == [
+        "resource", "kw", "status", "farbe", "gap", "norm_gap", "empfehlung"
+    ]
@@ -0,0 +1,70 @@
+"""Tests for the forecast assimilation recurrence."""
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mvp_app.simulate import _assimilate_series
+
+ALPHA = 0.3
+DATES = pd.date_range("2025-01-01", "2025-12-31", freq="D")
+
+
+def _reference(forecast_raw, actuals, mask, alpha):
+    """Plain per-row loop the event-indexed kernel must reproduce."""
+
+    correction = 0.0
+    adjusted = []
+    for baseline, actual, assimilate in zip(forecast_raw, actuals, mask):
+        if assimilate:
+            correction = (1 - alpha) * correction + alpha * (actual - baseline)
+        adjusted.append(baseline + correction)
+    return np.array(adjusted)
+
+
+def _series(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    forecast_raw = 100 + rng.normal(0, 10, len(DATES))
+    actuals = forecast_raw + rng.normal(5, 8, len(DATES))
+    return forecast_raw, actuals
+
+
+def _mask(rule, today: date) -> np.ndarray:
+    return (DATES.to_numpy() <= np.datetime64(today)) & rule(DATES)
+
+
+@pytest.mark.parametrize(
+    "mask",
+    [
+        _mask(lambda d: d.weekday == 6, date(2025, 6, 18)),
+        _mask(lambda d: d.day == 1, date(2025, 6, 18)),
+        _mask(lambda d: d.weekday == 6, date(2025, 12, 31)),
+        _mask(lambda d: d.dayofyear == 1, date(2025, 6, 18)),
+        np.zeros(len(DATES), dtype=bool),
+        _mask(lambda d: d.weekday == 6, date(2024, 12, 31)),
+    ],
+    ids=["weekly", "monthly", "weekly_full_year", "first_day_only", "no_events", "all_future"],
+)
+def test_assimilate_series_matches_per_row_loop(mask):
+    forecast_raw, actuals = _series()
+    result = _assimilate_series(forecast_raw, actuals, mask, ALPHA)
+    np.testing.assert_allclose(result, _reference(forecast_raw, actuals, mask, ALPHA))
+
+
+def test_assimilate_series_without_events_returns_raw_forecast():
+    forecast_raw, actuals = _series(seed=1)
+    result = _assimilate_series(forecast_raw, actuals, np.zeros(len(DATES), bool), ALPHA)
+    np.testing.assert_array_equal(result, forecast_raw)
+
+
+def test_assimilate_series_keeps_last_correction_after_today():
+    forecast_raw, actuals = _series(seed=2)
+    mask = _mask(lambda d: d.weekday == 6, date(2025, 3, 1))
+    result = _assimilate_series(forecast_raw, actuals, mask, ALPHA)
+    last_event = np.flatnonzero(mask)[-1]
+    corrections = result - forecast_raw
+    np.testing.assert_allclose(corrections[last_event:], corrections[last_event])
+    np.testing.assert_array_equal(corrections[: np.flatnonzero(mask)[0]], 0.0)
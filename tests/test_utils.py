@@ -0,0 +1,59 @@
+"""Tests for the native SVG export of line charts."""
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from mvp_app import utils
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+
+def _yearly_chart() -> go.Figure:
+    dates = pd.date_range("2025-01-01", "2025-12-31", freq="D")
+    rng = np.random.default_rng(0)
+    fig = go.Figure()
+    for name, dash in (("Plan", "dash"), ("Prognose", None), ("Kapazität", "dot")):
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=100 + rng.normal(0, 5, len(dates)).cumsum(),
+                mode="lines",
+                name=name,
+                line=dict(dash=dash),
+            )
+        )
+    fig.update_layout(title="Jahresverlauf – Betten", yaxis_title="Einheiten")
+    return fig
+
+
+def test_yearly_chart_svg_is_well_formed_without_kaleido(monkeypatch):
+    monkeypatch.setattr(utils, "kaleido", None)
+    svg = utils.figure_to_svg_bytes(_yearly_chart())
+    root = ET.fromstring(svg)
+    assert root.tag == f"{SVG_NS}svg"
+    assert root.get("width") == str(utils.SVG_WIDTH)
+    assert root.get("height") == str(utils.SVG_HEIGHT)
+    data_paths = [path for path in root.iter(f"{SVG_NS}path") if path.get("fill") == "none"]
+    assert len(data_paths) >= 3
+    texts = "".join(text.text or "" for text in root.iter(f"{SVG_NS}text"))
+    assert "Jahresverlauf – Betten" in texts
+    assert "Prognose" in texts
+
+
+def test_non_line_figure_without_kaleido_raises_clear_error(monkeypatch):
+    monkeypatch.setattr(utils, "kaleido", None)
+    with pytest.raises(RuntimeError, match="kaleido"):
+        utils.figure_to_svg_bytes(go.Figure(go.Bar(x=[1, 2], y=[3, 4])))
+
+
+@pytest.mark.filterwarnings("ignore:All-NaN slice")
+def test_all_nan_line_without_kaleido_raises_clear_error(monkeypatch):
+    monkeypatch.setattr(utils, "kaleido", None)
+    fig = go.Figure(go.Scatter(x=[1, 2, 3], y=[np.nan] * 3))
+    with pytest.raises(RuntimeError, match="kaleido"):
+        utils.figure_to_svg_bytes(fig)